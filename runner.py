@@ -2,12 +2,14 @@ import asyncio
 import inspect
 import json
 import os
+from functools import lru_cache
 from importlib.util import module_from_spec, spec_from_file_location
 from pathlib import Path
+from types import ModuleType
 
 import allure
+import orjson
 import pytest
-import yaml
 from openai import AsyncOpenAI
 
 from src.ai_model_client import ModelInterface
@@ -17,16 +19,39 @@ from src.schema.py_schema import FunctionSchema
 
 
 def load_yaml_conf(file_path):
+    import yaml
+
+    try:
+        loader = yaml.CSafeLoader
+    except AttributeError:
+        loader = yaml.SafeLoader
+
     with open(file_path, encoding="utf-8") as f:
-        return yaml.safe_load(f)
+        return yaml.load(f, Loader=loader)
+
+
+@lru_cache(maxsize=8)
+def load_schema_data(schema_path: str):
+    """Читает и парсит файл схемы один раз на сессию."""
+    with open(schema_path, "rb") as f:
+        return orjson.loads(f.read())
+
+
+_loaded_modules: dict[str, ModuleType] = {}
 
 
 def get_function_from_py(py_file: Path, func_name: str):
-    spec = spec_from_file_location(func_name, py_file.absolute())
-    if spec is None or spec.loader is None:
-        pytest.fail(f"❌ Не удалось загрузить модуль из {py_file}")
-    mod = module_from_spec(spec)
-    spec.loader.exec_module(mod)
+    module_key = str(py_file.absolute())
+    mod = _loaded_modules.get(module_key)
+
+    if mod is None:
+        spec = spec_from_file_location(func_name, module_key)
+        if spec is None or spec.loader is None:
+            pytest.fail(f"❌ Не удалось загрузить модуль из {py_file}")
+        mod = module_from_spec(spec)
+        spec.loader.exec_module(mod)
+        _loaded_modules[module_key] = mod
+
     if not hasattr(mod, func_name):
         pytest.fail(f"❌ Функция '{func_name}' не найдена в файле!")
     return getattr(mod, func_name)
@@ -48,19 +73,16 @@ def test_local_function_sync():
     func_name = py_file.stem
 
     with allure.step(f"Загрузка JSON схемы: {json_file.name}"):
-        with open(json_file, encoding="utf-8") as f:
-            data = json.load(f)
-            schema_dict = (
-                data[func_name]
-                if isinstance(data, dict) and func_name in data
-                else data
-            )
-            schema = Schema.model_validate(schema_dict)
-            allure.attach(
-                json.dumps(schema_dict, indent=2, ensure_ascii=False),
-                "Schema JSON",
-                allure.attachment_type.JSON,
-            )
+        data = load_schema_data(str(json_file))
+        schema_dict = (
+            data[func_name] if isinstance(data, dict) and func_name in data else data
+        )
+        schema = Schema.model_validate(schema_dict)
+        allure.attach(
+            json.dumps(schema_dict, indent=2, ensure_ascii=False),
+            "Schema JSON",
+            allure.attachment_type.JSON,
+        )
 
     with allure.step(f"Инспекция Python функции: {func_name}"):
         func = get_function_from_py(py_file, func_name)
@@ -95,10 +117,9 @@ async def test_ai_inference():
     if not conf_path or not schema_path:
         pytest.fail("Проверьте переменные INPUT_CONFIG_PATH и INPUT_SCHEMA_PATH")
 
-    with open(schema_path, encoding="utf-8") as f:
-        s_data = json.load(f)
-        s_dict = list(s_data.values())[0] if isinstance(s_data, dict) else s_data
-        schema = Schema.model_validate(s_dict)
+    s_data = load_schema_data(schema_path)
+    s_dict = list(s_data.values())[0] if isinstance(s_data, dict) else s_data
+    schema = Schema.model_validate(s_dict)
 
     raw_conf = load_yaml_conf(conf_path)
 
@@ -146,13 +167,11 @@ async def test_ai_inference():
         )
 
         errors = []
-        for i, res in enumerate(results):
-            query_preview = (
-                root_config.queries[i][:30] + "..."
-                if len(root_config.queries[i]) > 30
-                else root_config.queries[i]
-            )
-            name = f"Query {i + 1}: {query_preview}"
+        for i, (query, res) in enumerate(
+            zip(root_config.queries, results, strict=True), 1
+        ):
+            query_preview = query[:30] + "..." if len(query) > 30 else query
+            name = f"Query {i}: {query_preview}"
 
             if isinstance(res, Exception):
                 errors.append(res)
@@ -1,19 +1,102 @@
-import json
+import hashlib
 import os
+from dataclasses import asdict
+from pathlib import Path
 from typing import Any
 
 import openai
+import orjson
 from openai import AsyncOpenAI
 from openai.types.chat import (
     ChatCompletionFunctionToolParam,
+    ChatCompletionMessage,
     ChatCompletionUserMessageParam,
 )
 from openai.types.shared_params.function_definition import FunctionDefinition
 
 from src.exceptions.custom_exceptions import LLMGenerationError, LLMMismatchError
-from src.schema.client_schema import ClientModel, ModelConfig, RouterConfig
+from src.schema.client_schema import ClientModel, ModelConfig, RouterConfig, UsageStats
 from src.schema.json_schema import Schema
 
+_tools_cache: dict[int, tuple[Schema, list[ChatCompletionFunctionToolParam]]] = {}
+
+_created_cache_dirs: set[str] = set()
+
+
+def _cache_key(
+    router_conf: "RouterConfig",
+    model_conf: "ModelConfig",
+    query: str,
+    json_schema: Schema,
+) -> str:
+    """Детерминированный ключ кеша по всем параметрам, влияющим на ответ."""
+    payload = orjson.dumps(
+        {
+            "model": model_conf.model_id,
+            "role": router_conf.system_prompt,
+            "params": model_conf.get_params(),
+            "tool_choice": router_conf.tool_choice,
+            "query": query,
+            "schema": {
+                "name": json_schema.name,
+                "description": json_schema.description,
+                "parameters": json_schema.parameters_payload,
+            },
+        },
+        option=orjson.OPT_SORT_KEYS,
+    )
+    return hashlib.blake2b(payload, digest_size=16).hexdigest()
+
+
+def _cache_path(cache_dir: str, key: str) -> Path:
+    if cache_dir not in _created_cache_dirs:
+        os.makedirs(cache_dir, exist_ok=True)
+        _created_cache_dirs.add(cache_dir)
+    return Path(cache_dir) / f"{key}.json"
+
+
+def _load_cached_response(cache_file: Path) -> dict[str, Any] | None:
+    if not cache_file.exists():
+        return None
+
+    try:
+        with open(cache_file, "rb") as f:
+            data = orjson.loads(f.read())
+        if not isinstance(data, dict) or "message" not in data:
+            return None
+        data["message"] = ChatCompletionMessage.model_validate(data["message"])
+    except (OSError, ValueError):
+        return None
+
+    return data
+
+
+def _store_cached_response(cache_file: Path, result: dict[str, Any]) -> None:
+    payload = {
+        "message": result["message"].model_dump(mode="json"),
+        "usage": result["usage"],
+    }
+    tmp_file = cache_file.with_suffix(".tmp")
+    with open(tmp_file, "wb") as f:
+        f.write(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    os.replace(tmp_file, cache_file)
+
+
+def _tools_for_schema(json_schema: Schema) -> list[ChatCompletionFunctionToolParam]:
+    """Собирает tools для схемы один раз и переиспользует между запросами."""
+    cached = _tools_cache.get(id(json_schema))
+    if cached is not None and cached[0] is json_schema:
+        return cached[1]
+
+    func = FunctionDefinition(
+        name=json_schema.name,
+        description=json_schema.description,
+        parameters=json_schema.parameters_payload,
+    )
+    tools = [ChatCompletionFunctionToolParam(type="function", function=func)]
+    _tools_cache[id(json_schema)] = (json_schema, tools)
+    return tools
+
 
 class ModelInterface:
     @staticmethod
@@ -25,17 +108,15 @@ class ModelInterface:
         query: str,
         json_schema: Schema,
     ):
-        func = FunctionDefinition(
-            name=json_schema.name,
-            description=json_schema.description,
-            parameters=json_schema.parameters.model_dump(
-                by_alias=True, exclude_none=True
-            ),
-        )
+        cache_file: Path | None = None
+        if router_conf.use_cache:
+            key = _cache_key(router_conf, model_conf, query, json_schema)
+            cache_file = _cache_path(router_conf.cache_dir, key)
+            cached = _load_cached_response(cache_file)
+            if cached is not None:
+                return cached
 
-        tools: list[ChatCompletionFunctionToolParam] = [
-            ChatCompletionFunctionToolParam(type="function", function=func)
-        ]
+        tools = _tools_for_schema(json_schema)
 
         model_params: dict[str, Any] = model_conf.get_params()
 
@@ -73,19 +154,14 @@ class ModelInterface:
                 fields={"response_id": getattr(response, "id", "unknown")},
             )
 
-        # !TODO : Создание dataclass вместо прямых полей в pydantic
-        request_usage = 0
-        response_usage = 0
-        total_usage = 0
-
+        usage = UsageStats()
         if response.usage:
-            request_usage = response.usage.prompt_tokens
-            response_usage = response.usage.completion_tokens
-            total_usage = response.usage.total_tokens
-
-            client_conf._request_token += request_usage
-            client_conf._response_token += response_usage
-            client_conf._total_token += total_usage
+            usage = UsageStats(
+                prompt_tokens=response.usage.prompt_tokens,
+                completion_tokens=response.usage.completion_tokens,
+                total_tokens=response.usage.total_tokens,
+            )
+            client_conf.add_usage(usage)
 
         choice = response.choices[0]
         message = choice.message
@@ -94,14 +170,13 @@ class ModelInterface:
         if message.tool_calls:
             called_tool = message.tool_calls[0].function.name
             if called_tool == json_schema.name:
-                return {
+                result = {
                     "message": message,
-                    "usage": {
-                        "prompt_tokens": request_usage,
-                        "completion_tokens": response_usage,
-                        "total_tokens": total_usage,
-                    },
+                    "usage": asdict(usage),
                 }
+                if cache_file is not None:
+                    _store_cached_response(cache_file, result)
+                return result
 
             raise LLMMismatchError(
                 message="Вызвана неверная функция",
@@ -132,16 +207,22 @@ class ModelInterface:
 
     @staticmethod
     def ci_report(results, output_path="test_results.json"):
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results, f, ensure_ascii=False, indent=2)
+        with open(output_path, "wb") as f:
+            f.write(
+                orjson.dumps(
+                    results, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS
+                )
+            )
 
         summary_path = os.getenv("GITHUB_STEP_SUMMARY")
         if summary_path:
+            parts = ["### Результаты тестов\n\n"]
+            for i, detail in enumerate(results.get("details", []), 1):
+                parts.append(f"#### Тест {i}\n")
+                parts.append(f"- Запрос: {detail.get('query', '')}\n")
+                for step in detail.get("execution_chain", []):
+                    parts.append(f"- Функция: {step['function']}\n")
+                    parts.append(f"- Результат: {step['result']}\n\n")
+
             with open(summary_path, "a", encoding="utf-8") as f:
-                f.write("### Результаты тестов\n\n")
-                for i, detail in enumerate(results.get("details", []), 1):
-                    f.write(f"#### Тест {i}\n")
-                    f.write(f"- Запрос: {detail.get('query', '')}\n")
-                    for step in detail.get("execution_chain", []):
-                        f.write(f"- Функция: {step['function']}\n")
-                        f.write(f"- Результат: {step['result']}\n\n")
+                f.write("".join(parts))
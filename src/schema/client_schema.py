@@ -1,17 +1,8 @@
-# def substitute_placeholders(text: str) -> str:
-#     """
-#     Заменяет маркеры вида secret.KEY на значения из переменных окружения.
-#     Если переменной нет, оставляет маркер как есть.
-#     """
-#     pattern = r"secret\.([A-Z0-9_]+)"
-
-#     def replacer(match):
-#         key = match.group(1)
-#         return os.getenv(key, match.group(0))
-
-#     return re.sub(pattern, replacer, text)
-
 import inspect
+import os
+import re
+from dataclasses import dataclass
+from functools import cached_property, lru_cache
 from typing import Annotated, Any, Literal
 
 from openai.types.chat import ChatCompletionSystemMessageParam
@@ -31,6 +22,66 @@ from src.schema.settings import api_keys_storage
 StrUrl = Annotated[HttpUrl, AfterValidator(lambda v: str(v))]
 
 
+@dataclass(slots=True, frozen=True)
+class UsageStats:
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+
+
+_SECRET_SENTINEL = "<#secret."
+_SECRET_RE = re.compile(r"<#secret\.([A-Z0-9_]+)>")
+
+
+def substitute_placeholders(text: str) -> str:
+    """
+    Заменяет маркеры вида <#secret.KEY> на значения из переменных окружения.
+    Если переменной нет, оставляет маркер как есть.
+    """
+    if _SECRET_SENTINEL not in text:
+        return text
+    return _SECRET_RE.sub(lambda m: os.getenv(m.group(1), m.group(0)), text)
+
+
+def substitute_in_args(args: Any) -> Any:
+    """
+    Подставляет секреты во всех строках вложенной структуры dict/list.
+
+    Обход итеративный (явный стек вместо рекурсии), строки без маркера
+    пропускаются по дешёвой проверке подстроки, подстановка — на месте.
+    """
+    stack: list[Any] = [args]
+    while stack:
+        node = stack.pop()
+
+        if isinstance(node, dict):
+            items: Any = node.items()
+        elif isinstance(node, list):
+            items = enumerate(node)
+        else:
+            continue
+
+        for key, value in items:
+            if isinstance(value, str):
+                if _SECRET_SENTINEL in value:
+                    node[key] = substitute_placeholders(value)
+            elif isinstance(value, (dict, list)):
+                stack.append(value)
+
+    return args
+
+
+@lru_cache(maxsize=1)
+def _completions_create_params() -> frozenset[str] | None:
+    """Имена параметров AsyncCompletions.create — вычисляются один раз."""
+    try:
+        from openai.resources.chat.completions import AsyncCompletions
+
+        return frozenset(inspect.signature(AsyncCompletions.create).parameters)
+    except (ImportError, AttributeError):
+        return None
+
+
 class ModelConfig(BaseModel):
     model_id: str = Field(alias="name")
     semaphore: int = Field(ge=1)
@@ -43,16 +94,13 @@ class ModelConfig(BaseModel):
 
     @model_validator(mode="after")
     def filter_extra_params(self) -> "ModelConfig":
-        try:
-            from openai.resources.chat.completions import AsyncCompletions
-
-            sig = inspect.signature(AsyncCompletions.create)
-        except (ImportError, AttributeError):
+        allowed_params = _completions_create_params()
+        if allowed_params is None:
             return self
 
         if self.model_extra:
             self._properties = {
-                k: v for k, v in self.model_extra.items() if k in sig.parameters
+                k: v for k, v in self.model_extra.items() if k in allowed_params
             }
         return self
 
@@ -73,10 +121,12 @@ class RouterConfig(BaseModel):
     max_retries: int = Field(default=3, ge=1)
     retry_delay: float = Field(default=1.3, ge=0.5)
     api_key: SecretStr | None = None
+    use_cache: bool = False
+    cache_dir: str = ".llm_cache"
 
     model_config = ConfigDict(populate_by_name=True)
 
-    @property
+    @cached_property
     def system_message(self) -> ChatCompletionSystemMessageParam:
         return ChatCompletionSystemMessageParam(
             role="system", content=self.system_prompt
@@ -108,6 +158,8 @@ class ClientModel(BaseModel):
         if not isinstance(data, dict):
             return data
 
+        substitute_in_args(data)
+
         if "queries" in data and isinstance(data["queries"], list):
             data["queries"] = [
                 (q.get("query") if isinstance(q, dict) else q)
@@ -116,6 +168,11 @@ class ClientModel(BaseModel):
             ]
         return data
 
+    def add_usage(self, usage: UsageStats) -> None:
+        self._request_token += usage.prompt_tokens
+        self._response_token += usage.completion_tokens
+        self._total_token += usage.total_tokens
+
     @property
     def usage_report(self) -> str:
         """Красивый отчет о расходе токенов"""
@@ -1,4 +1,5 @@
 from collections.abc import Sequence
+from functools import cached_property
 from typing import Any, Literal
 
 from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, model_validator
@@ -56,15 +57,16 @@ class Property(BaseModel):
     model_config = ConfigDict(populate_by_name=True, extra="allow")
 
 
+REQUIRED_FIELDS_IN_PROP: frozenset[str] = frozenset(
+    DEFAULT_REQUIRED_FIELDS_PROPERTIES
+) & frozenset(Property.model_fields.keys())
+
+
 class Parameters(BaseModel):
     parameter_type: Literal["object"] = Field(alias="type")
     properties: dict[str, Property]
     required: list[str] = Field(default_factory=list)
-    _required_fields_in_prop: list[str] = PrivateAttr(
-        default_factory=lambda: list(
-            set(DEFAULT_REQUIRED_FIELDS_PROPERTIES) & set(Property.model_fields.keys())
-        )
-    )
+    _required_fields_in_prop: frozenset[str] = PrivateAttr(default=REQUIRED_FIELDS_IN_PROP)
 
     model_config = ConfigDict(populate_by_name=True, extra="allow")
 
@@ -76,6 +78,11 @@ class Schema(BaseModel):
 
     model_config = ConfigDict(extra="allow")
 
+    @cached_property
+    def parameters_payload(self) -> dict[str, Any]:
+        """Сериализованные параметры для FunctionDefinition (считаются один раз)."""
+        return self.parameters.model_dump(by_alias=True, exclude_none=True)
+
     @model_validator(mode="after")
     def validate_all_extra_fields(self):
         errors = get_extra_field_errors(self)
@@ -92,16 +99,16 @@ class Schema(BaseModel):
                 )
             )
 
+        required_in_prop = self.parameters._required_fields_in_prop
+
         for key, prop in self.parameters.properties.items():
-            missing = (
-                set(self.parameters._required_fields_in_prop) - prop.model_fields_set
-            )
+            missing = required_in_prop - prop.model_fields_set
 
             if missing:
                 errors.append(
                     EmptyRequiredFields(
                         message=f"В ключе '{key}' пропущены обязательные поля",
-                        fields=missing,
+                        fields=set(missing),
                     )
                 )
 
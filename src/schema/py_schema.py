@@ -1,4 +1,5 @@
 import ast
+import logging
 from dataclasses import dataclass
 from inspect import Parameter
 from types import MappingProxyType
@@ -15,19 +16,26 @@ from src.exceptions.custom_exceptions import (
 from src.schema.interfaces import TYPE_MAPPING
 from src.schema.json_schema import Schema
 
+logger = logging.getLogger(__name__)
+
+
+_TYPE_ADAPTERS: dict[str, TypeAdapter] = {
+    json_type: TypeAdapter(py_type) for json_type, py_type in TYPE_MAPPING.items()
+}
+
 
 def normalize_value(val: Any, target_type_str: str) -> Any:
-    target_type = TYPE_MAPPING.get(target_type_str)
-    if target_type is None:
+    adapter = _TYPE_ADAPTERS.get(target_type_str)
+    if adapter is None:
         return val
 
     try:
-        return TypeAdapter(target_type).validate_python(val)
+        return adapter.validate_python(val)
     except Exception:
         return val
 
 
-@dataclass(slots=True)
+@dataclass(slots=True, frozen=True)
 class InfoArg:
     stroke: int = 0
     key: str = ""
@@ -79,7 +87,7 @@ class FunctionSchema(BaseModel):
 
                 card = InfoArg(stroke=node.lineno, key=key_val, val=default_val)
                 found_args.append(card)
-                print(f"Найдено: {card}")
+                logger.debug("Найдено: %s", card)
 
         self._args_map = found_args
 
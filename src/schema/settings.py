@@ -1,7 +1,14 @@
+from functools import lru_cache
+
 from pydantic import SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
+@lru_cache(maxsize=32)
+def _normalize_provider_name(provider_name: str) -> str:
+    return provider_name.lower().replace("-", "_")
+
+
 class ApiKeys(BaseSettings):
     model_config = SettingsConfigDict(
         env_prefix="AI_API_KEY",
@@ -9,7 +16,7 @@ class ApiKeys(BaseSettings):
     )
 
     def get_key_for(self, provider_name: str) -> SecretStr | None:
-        attr_name = provider_name.lower().replace("-", "_")
+        attr_name = _normalize_provider_name(provider_name)
         value = getattr(self, attr_name, None)
 
         return (